@@ -18,10 +18,20 @@ Button Controls:
 - GPIO 22: Display Custom Image
 """
 
+import os
+import errno
 import time
-from rpi_ws281x import PixelStrip, Color
-import RPi.GPIO as GPIO
-import math
+from time import monotonic_ns  # Same clock as the kernel's hall edge timestamps
+import ctypes
+import ctypes.util
+import threading
+from collections import deque
+from datetime import timedelta
+from rpi_ws281x import PixelStrip
+import _rpi_ws281x as ws
+import gpiod
+from gpiod.line import Bias, Direction, Edge, Value
+import numpy as np
 from PIL import Image
 
 # ============== HARDWARE CONFIGURATION ==============
@@ -36,6 +46,20 @@ LED_CHANNEL = 0
 # WS2815 Color Order - set to True for GRB strips (most WS2815), False for RGB
 LED_IS_GRB = True  # Your strip uses GRB color order
 
+# Alternative LED output: drive the strip's data line from SPI MOSI (GPIO 10)
+# instead of PWM on LED_PIN. Every line is pre-encoded into WS281x bit
+# patterns when the mode changes, so showing a line is a single SPI write.
+# PWM stays the default: strip.show() only waits for the previous line's DMA
+# and returns once the next one is started, so it already overlaps the LED
+# shift-out with the display loop, while the SPI write blocks for the whole
+# transfer (~2.5ms for 72 LEDs).
+LED_USE_SPI = False
+SPI_BUS = 0
+SPI_DEVICE = 0
+SPI_SPEED_HZ = 2_400_000  # 3 SPI bits per WS281x bit at 800kHz
+SPI_RESET_BYTES = 90      # ~300µs of low level to latch the LEDs
+
+GPIO_CHIP = "/dev/gpiochip0"  # Kernel GPIO character device for the hall sensor
 HALL_SENSOR_PIN = 4
 BUTTON_CIRCLE = 17
 BUTTON_SQUARE = 27
@@ -50,6 +74,8 @@ LED_UPDATE_TIME_US = 2800  # ~2.8ms for 72 WS2815 LEDs
 DEFAULT_RPM = 900
 MIN_RPM = 250      # Reject readings below this (noise)
 MAX_RPM = 1400     # Reject readings above this (noise)
+MIN_ROTATION_US = 60_000_000 // MAX_RPM  # ~42ms at 1400 RPM
+MAX_ROTATION_US = 60_000_000 // MIN_RPM  # ~240ms at 250 RPM
 
 # IMPORTANT: Based on your logs showing 800-1200 RPM typical:
 # At 1200 RPM: rotation = 50,000µs → max 17 divisions
@@ -64,35 +90,56 @@ NUM_DIVISIONS = 16  # Safe for your 800-1200 RPM range (22.5° per division)
 
 # ============== DISPLAY CONFIGURATION ==============
 BRIGHTNESS_RATIO = 0.8  # Higher brightness for faster spin (less persistence time)
+BRIGHTNESS_Q8 = round(BRIGHTNESS_RATIO * 256)  # Same ratio as fixed-point x/256
 LINES_TO_SHIFT = -3     # Adjusted for 16 divisions
 
-# Timing safety margin (microseconds to reserve for overhead)
-TIMING_MARGIN_US = 300  # Increased for more headroom
+# Line waits sleep in the kernel, then busy-wait this final stretch to absorb
+# the scheduler's wake-up latency (under ~50µs for a SCHED_FIFO thread)
+SLEEP_SPIN_US = 50
+
+# The display runs on its own SCHED_FIFO thread; buttons are polled on the
+# main thread at a human pace
+DISPLAY_THREAD_PRIORITY = 80   # 1-99, higher preempts more (needs root)
+HALL_THREAD_PRIORITY = 70      # Hall edge thread - real-time too, but never ahead of the display
+DISPLAY_CPU = 3                # Core the display thread is pinned to (add isolcpus=3 to cmdline.txt to reserve it)
+BUTTON_POLL_INTERVAL = 0.016   # Seconds between button polls (~60 Hz)
 
 # ============== NOISE FILTERING ==============
 # Hall sensor debounce - ignore triggers too close together
-MIN_ROTATION_TIME_US = 40000   # Max 1500 RPM = 40ms minimum between triggers
 HALL_DEBOUNCE_US = 5000        # Ignore triggers within 5ms of last one
 
-# RPM change threshold - reject sudden jumps (likely noise)
-MAX_RPM_CHANGE_PERCENT = 40    # Reject if RPM changes more than 40% suddenly
+# RPM smoothing - scalar Kalman filter on stable_rpm
+RPM_PROCESS_NOISE = 4.0              # Minimum expected speed change per rotation (RPM², lower = smoother)
+RPM_INNOVATION_WEIGHT = 0.2          # EWMA weight of each reading's surprise, raises the process noise while the speed moves
+RPM_MIN_MEASUREMENT_VARIANCE = 1.0   # Floor for the measured reading noise (RPM²)
+RPM_GATE_SIGMA = 4.0                 # Reject readings this many σ away from the prediction
 
 # ============== GLOBAL VARIABLES ==============
 current_mode = "circle"
-display_data = []
+mode_frames = {}                   # Generated data for each mode name, filled once by main()
+spi_frames = None                  # Per-line bytes of the current frame encoded for SPI when LED_USE_SPI
+display_lines = None               # ctypes view of each line of the current frame, for memmove
 
 # Timing variables with proper defaults
 last_rotation_micros = 0
-rotation_time_micros = int(60_000_000 / DEFAULT_RPM)  # Default based on expected RPM
+rotation_time_micros = 60_000_000 // DEFAULT_RPM  # Default based on expected RPM
 time_per_line_micros = rotation_time_micros // NUM_DIVISIONS
+# Start of each line relative to the hall edge - integer µs, recomputed once
+# per rotation so the display loop does no division per line
+line_offsets_micros = [i * rotation_time_micros // NUM_DIVISIONS for i in range(NUM_DIVISIONS)]
 current_line = 0
-rotation_active = False
+rotation_start_micros = 0          # When line 0 of the rotation being drawn started
+display_step = None                # Called by display_loop() each pass, see handle_hall_edge()
 
 # RPM tracking with aggressive smoothing
 current_rpm = DEFAULT_RPM
 stable_rpm = DEFAULT_RPM           # Filtered/stable RPM value
-rpm_history = []                   # Store RPM readings for smoothing
-RPM_HISTORY_SIZE = 15              # Increased! More samples = smoother (was 5)
+stable_rpm_variance = 300.0 ** 2   # Uncertainty of stable_rpm (RPM²) - large until readings arrive
+RPM_HISTORY_SIZE = 15              # Readings used to estimate the measurement noise
+rpm_history = deque(maxlen=RPM_HISTORY_SIZE)  # Ring of recent RPM readings for smoothing
+rpm_sq_diffs = deque(maxlen=RPM_HISTORY_SIZE - 1)  # Squared change between consecutive readings
+rpm_sq_diff_sum = 0.0              # Running sum of rpm_sq_diffs
+rpm_innovation_sq_avg = 0.0        # Running average of squared innovations (RPM²), gated readings included
 rpm_locked = False                 # Once stable, lock the RPM
 rpm_lock_threshold = 10            # Lock after this many stable readings
 rpm_stable_count = 0               # Count of consecutive stable readings
@@ -101,12 +148,11 @@ rpm_stable_count = 0               # Count of consecutive stable readings
 actual_line_time_us = 0
 
 # Button state tracking
-last_button_states = {BUTTON_CIRCLE: GPIO.HIGH, BUTTON_SQUARE: GPIO.HIGH, BUTTON_IMAGE: GPIO.HIGH}
-last_button_time = {BUTTON_CIRCLE: 0, BUTTON_SQUARE: 0, BUTTON_IMAGE: 0}
-DEBOUNCE_TIME = 0.3
+BUTTON_DEBOUNCE_US = 20000         # Kernel only reports a button level once stable this long
 
 # Hall sensor tracking with debouncing
-last_hall_state = GPIO.LOW
+hall_edges = deque()               # Edge timestamps (µs) queued by watch_hall_sensor()
+stop_display = threading.Event()   # Set on shutdown to end display_loop()
 last_hall_trigger_time = 0         # For debouncing
 rotation_count = 0
 valid_rotation_count = 0           # Only count valid (non-noise) rotations
@@ -114,24 +160,40 @@ missed_lines_count = 0             # Track if we're missing lines
 noise_rejected_count = 0           # Track rejected noise triggers
 
 # ============== GPIO SETUP ==============
-GPIO.setmode(GPIO.BCM)
-GPIO.setwarnings(False)
-
-try:
-    GPIO.cleanup()
-    time.sleep(0.5)
-except:
-    pass
-
-GPIO.setmode(GPIO.BCM)
-GPIO.setup(HALL_SENSOR_PIN, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
-GPIO.setup(BUTTON_CIRCLE, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-GPIO.setup(BUTTON_SQUARE, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-GPIO.setup(BUTTON_IMAGE, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-
-# Initialize LED strip
-strip = PixelStrip(NUM_LEDS, LED_PIN, LED_FREQ_HZ, LED_DMA, LED_INVERT, LED_BRIGHTNESS, LED_CHANNEL)
-strip.begin()
+# Buttons are requested together from the kernel GPIO driver, so one
+# get_values() call reads all three. Active-low: a pressed button reads ACTIVE.
+# The kernel debounces them too, so contact bounce never reaches check_buttons().
+BUTTON_PINS = (BUTTON_CIRCLE, BUTTON_SQUARE, BUTTON_IMAGE)
+last_button_states = [Value.INACTIVE] * len(BUTTON_PINS)  # Last read of each button, in BUTTONS order
+button_request = gpiod.request_lines(GPIO_CHIP, consumer="pov-fan-buttons", config={
+    BUTTON_PINS: gpiod.LineSettings(direction=Direction.INPUT, bias=Bias.PULL_UP, active_low=True,
+                                    debounce_period=timedelta(microseconds=BUTTON_DEBOUNCE_US))
+})
+
+# Initialize LED output
+if LED_USE_SPI:
+    import spidev
+    spi = spidev.SpiDev()
+    spi.open(SPI_BUS, SPI_DEVICE)
+    spi.max_speed_hz = SPI_SPEED_HZ
+    spi.mode = 0
+    spi_write = spi.writebytes2  # Bound once - called every line
+else:
+    strip = PixelStrip(NUM_LEDS, LED_PIN, LED_FREQ_HZ, LED_DMA, LED_INVERT, LED_BRIGHTNESS, LED_CHANNEL)
+    strip.begin()
+    
+    # The strip's native LED buffer (allocated by begin()). Copying a whole
+    # line into it replaces NUM_LEDS setPixelColor() calls - checked once
+    # here so that copy can never run past the end of the buffer.
+    if strip.numPixels() != NUM_LEDS:
+        raise RuntimeError(f"LED buffer holds {strip.numPixels()} LEDs, expected {NUM_LEDS}")
+    led_buffer_addr = int(ws.ws2811_channel_t_leds_get(strip._channel))
+    led_buffer = np.ctypeslib.as_array((ctypes.c_uint32 * NUM_LEDS).from_address(led_buffer_addr))
+    LINE_BYTES = NUM_LEDS * 4
+    
+    # Bound once - both are called every line
+    memmove = ctypes.memmove
+    strip_show = strip.show
 
 # ============== UTILITY FUNCTIONS ==============
 
@@ -146,35 +208,124 @@ def make_color(r, g, b):
     
     Returns:
         Color value in the correct byte order for your LED strip
+        (packed inline - same bits as rpi_ws281x.Color without the call)
     """
     if LED_IS_GRB:
         # WS2815 GRB order: swap R and G
-        return Color(int(g), int(r), int(b))
+        return (int(g) << 16) | (int(r) << 8) | int(b)
     else:
         # Standard RGB order
-        return Color(int(r), int(g), int(b))
+        return (int(r) << 16) | (int(g) << 8) | int(b)
+
+
+def pack_colors(r, g, b):
+    """
+    Vectorized make_color() for NumPy arrays of channel values.
+    
+    Fractional values are truncated just like int() in make_color().
+    
+    Returns:
+        uint32 array of colors in the correct byte order for your LED strip
+    """
+    r = np.asarray(r).astype(np.uint32)
+    g = np.asarray(g).astype(np.uint32)
+    b = np.asarray(b).astype(np.uint32)
+    if LED_IS_GRB:
+        return (g << 16) | (r << 8) | b
+    return (r << 16) | (g << 8) | b
+
+
+def scale_brightness(value):
+    """
+    Apply BRIGHTNESS_RATIO to 0-255 channel values with integer math only.
+    Works on ints and on uint16 (or wider) NumPy arrays alike.
+    """
+    return (value * BRIGHTNESS_Q8) >> 8
+
+
+# SPI encoding of one data byte: each WS281x bit becomes 3 SPI bits,
+# 0b110 for a 1 and 0b100 for a 0 (MSB first) - 256 x 3 lookup table
+SPI_BYTE_LUT = np.array([
+    [(pattern >> shift) & 0xFF for shift in (16, 8, 0)]
+    for pattern in (
+        sum((0b110 if value & (0x80 >> bit) else 0b100) << (21 - 3 * bit) for bit in range(8))
+        for value in range(256)
+    )
+], dtype=np.uint8)
+
+
+def encode_spi_frames(lines):
+    """
+    Encode lines of packed colors into ready-to-send SPI bitstreams.
+    
+    Applies LED_BRIGHTNESS and sends the bytes in the same order rpi_ws281x
+    does for its default GRB strip type, so colors match the PWM output.
+    
+    Args:
+        lines: (lines, NUM_LEDS) uint32 array of packed colors
+    
+    Returns:
+        (lines, NUM_LEDS * 9 + SPI_RESET_BYTES) uint8 array
+    """
+    lines = np.ascontiguousarray(lines, dtype='<u4').reshape(-1, NUM_LEDS)
+    
+    # View each packed color as its 4 bytes (little-endian: bits 0-7 first)
+    # and pick the byte lanes in wire order - no per-channel shift and mask
+    wire = lines.view(np.uint8).reshape(len(lines), NUM_LEDS, 4)[..., [1, 2, 0]]
+    wire = (wire.astype(np.uint16) * (LED_BRIGHTNESS + 1)) >> 8
+    
+    frames = np.zeros((len(lines), NUM_LEDS * 9 + SPI_RESET_BYTES), dtype=np.uint8)
+    frames[:, :NUM_LEDS * 9] = SPI_BYTE_LUT[wire].reshape(len(lines), -1)
+    return frames
+
+
+def show_pixels(line):
+    """Show one line of packed colors (NUM_LEDS uint32) on the strip"""
+    if LED_USE_SPI:
+        spi.writebytes2(encode_spi_frames(line)[0])
+    else:
+        led_buffer[:] = line
+        strip.show()
 
 
 def clear_strip():
     """Turn off all LEDs"""
-    for i in range(NUM_LEDS):
-        strip.setPixelColor(i, make_color(0, 0, 0))
-    strip.show()
+    show_pixels(np.zeros(NUM_LEDS, dtype=np.uint32))
+
 
+# libc clock_nanosleep() - Python's time.sleep() only takes relative delays
+libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+CLOCK_MONOTONIC = 1
+TIMER_ABSTIME = 1
+MCL_CURRENT = 1
+MCL_FUTURE = 2
 
-def get_time_micros():
-    """Get current time in microseconds"""
-    return int(time.perf_counter() * 1_000_000)
 
+class Timespec(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+
+def sleep_until_ns(target_ns):
+    """Sleep until an absolute time on the monotonic clock (nanoseconds)"""
+    ts = Timespec(target_ns // 1_000_000_000, target_ns % 1_000_000_000)
+    # With TIMER_ABSTIME an interrupted sleep can simply be restarted
+    while libc.clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, ctypes.byref(ts), None) == errno.EINTR:
+        pass
 
 # ============== SHAPE GENERATION ==============
 
+# Angle of every display line in radians - computed once at startup and
+# shared by the generators, so a button press only does the per-shape work
+LINE_ANGLES_RAD = np.arange(NUM_DIVISIONS) * (2 * np.pi / NUM_DIVISIONS)
+LINE_COS = np.cos(LINE_ANGLES_RAD)
+LINE_SIN = np.sin(LINE_ANGLES_RAD)
+
 def generate_circle_data(radius_leds=28, color_rgb=(0, 255, 255)):
     """
     Generate circle data - displays at constant radius from center.
     With fewer divisions (16-20), we make the circle thicker for visibility.
     """
-    data = []
+    line = np.zeros(NUM_LEDS, dtype=np.uint32)
     center_led = NUM_LEDS // 2
     r, g, b = color_rgb
     
@@ -183,28 +334,20 @@ def generate_circle_data(radius_leds=28, color_rgb=(0, 255, 255)):
     circle_thickness = max(3, 7 - NUM_DIVISIONS // 5)  # 3-5 LEDs thick
     
     # Pre-calculate the color with brightness applied
-    pixel_color = make_color(r * BRIGHTNESS_RATIO, g * BRIGHTNESS_RATIO, b * BRIGHTNESS_RATIO)
-    off_color = make_color(0, 0, 0)
+    pixel_color = make_color(scale_brightness(r), scale_brightness(g), scale_brightness(b))
     
-    for angle_idx in range(NUM_DIVISIONS):
-        line = [off_color] * NUM_LEDS
-        
-        if radius_leds < NUM_LEDS // 2:
-            # Draw circle outline with thickness (both sides of strip)
-            for offset in range(-circle_thickness // 2, circle_thickness // 2 + 1):
-                # Inner half of strip (LEDs 0 to center)
-                led_pos_1 = center_led - radius_leds + offset
-                # Outer half of strip (LEDs center to end)
-                led_pos_2 = center_led + radius_leds + offset
-                
-                if 0 <= led_pos_1 < NUM_LEDS:
-                    line[led_pos_1] = pixel_color
-                if 0 <= led_pos_2 < NUM_LEDS:
-                    line[led_pos_2] = pixel_color
-        
-        data.append(line)
+    if radius_leds < NUM_LEDS // 2:
+        # Draw circle outline with thickness (both sides of strip)
+        offsets = np.arange(-circle_thickness // 2, circle_thickness // 2 + 1)
+        led_pos = np.concatenate((
+            center_led - radius_leds + offsets,   # Inner half of strip (LEDs 0 to center)
+            center_led + radius_leds + offsets,   # Outer half of strip (LEDs center to end)
+        ))
+        line[led_pos[(led_pos >= 0) & (led_pos < NUM_LEDS)]] = pixel_color
     
-    return data
+    # Same radius at every angle - every line is this one line (a read-only
+    # view, set_display_data() makes the one copy the display needs)
+    return np.broadcast_to(line, (NUM_DIVISIONS, NUM_LEDS))
 
 
 def generate_square_data(side_length_leds=24, color_rgb=(255, 0, 255)):
@@ -212,7 +355,7 @@ def generate_square_data(side_length_leds=24, color_rgb=(255, 0, 255)):
     Generate square using polar-to-cartesian math.
     Optimized for low division counts (16-20 divisions).
     """
-    data = []
+    data = np.zeros((NUM_DIVISIONS, NUM_LEDS), dtype=np.uint32)
     center_led = NUM_LEDS // 2
     r, g, b = color_rgb
     
@@ -223,95 +366,109 @@ def generate_square_data(side_length_leds=24, color_rgb=(255, 0, 255)):
     half_side = side_length_leds // 2
     
     # Pre-calculate colors
-    pixel_color = make_color(r * BRIGHTNESS_RATIO, g * BRIGHTNESS_RATIO, b * BRIGHTNESS_RATIO)
-    off_color = make_color(0, 0, 0)
+    pixel_color = make_color(scale_brightness(r), scale_brightness(g), scale_brightness(b))
     
-    for angle_idx in range(NUM_DIVISIONS):
-        line = [off_color] * NUM_LEDS
-        
-        # Calculate angle in radians
-        angle_rad = (angle_idx * 2 * math.pi / NUM_DIVISIONS)
-        
-        # Square formula: r = half_side / max(|cos(θ)|, |sin(θ)|)
-        cos_a = abs(math.cos(angle_rad))
-        sin_a = abs(math.sin(angle_rad))
-        max_trig = max(cos_a, sin_a, 0.001)
-        
-        # Distance from center to square edge
-        distance = int(half_side / max_trig)
-        distance = min(distance, center_led - 2)  # Keep within LED range
-        
-        # Draw thick outline
-        for offset in range(-edge_thickness // 2, edge_thickness // 2 + 1):
-            led_pos_1 = center_led - distance + offset
-            led_pos_2 = center_led + distance + offset
-            
-            if 0 <= led_pos_1 < NUM_LEDS:
-                line[led_pos_1] = pixel_color
-            if 0 <= led_pos_2 < NUM_LEDS:
-                line[led_pos_2] = pixel_color
-        
-        data.append(line)
+    # Square formula: r = half_side / max(|cos(θ)|, |sin(θ)|)
+    max_trig = np.maximum(np.maximum(np.abs(LINE_COS), np.abs(LINE_SIN)), 0.001)
+    
+    # Distance from center to square edge
+    distance = (half_side / max_trig).astype(np.int64)
+    distance = np.minimum(distance, center_led - 2)  # Keep within LED range
+    
+    # Draw thick outline - one row of LED positions per line
+    offsets = np.arange(-edge_thickness // 2, edge_thickness // 2 + 1)
+    led_pos = np.concatenate((
+        center_led - distance[:, None] + offsets,
+        center_led + distance[:, None] + offsets,
+    ), axis=1)
+    lines = np.broadcast_to(np.arange(NUM_DIVISIONS)[:, None], led_pos.shape)
+    
+    valid = (led_pos >= 0) & (led_pos < NUM_LEDS)
+    data[lines[valid], led_pos[valid]] = pixel_color
     
     return data
 
 
+def _sample_polar(pixels, cos_a, sin_a, radial_fracs):
+    """
+    Bilinearly sample rays of the image outwards from its center.
+    
+    Samples straight from the source pixels, so an image of any size maps
+    onto the same circle without resizing it first.
+    
+    Args:
+        pixels: (height, width, 3) uint8 image array
+        cos_a, sin_a: Cosine and sine of each ray's direction
+        radial_fracs: Distance of each sample point from the center, as a
+            fraction of the half width/height (1.0 = image edge)
+    
+    Returns:
+        (rays, samples) uint32 array of packed colors (black if off-image)
+    """
+    height, width = pixels.shape[:2]
+    
+    # Continuous pixel coordinates (pixel centers at whole numbers)
+    xs = (width / 2) * (1 + cos_a[:, None] * radial_fracs) - 0.5
+    ys = (height / 2) * (1 + sin_a[:, None] * radial_fracs) - 0.5
+    valid = (xs >= -0.5) & (xs <= width - 0.5) & (ys >= -0.5) & (ys <= height - 0.5)
+    
+    # Four neighbouring pixels and their weights (edges clamped)
+    x0 = np.floor(xs)
+    y0 = np.floor(ys)
+    fx = xs - x0
+    fy = ys - y0
+    x0 = x0.astype(np.int64)
+    y0 = y0.astype(np.int64)
+    x0, x1 = np.clip(x0, 0, width - 1), np.clip(x0 + 1, 0, width - 1)
+    y0, y1 = np.clip(y0, 0, height - 1), np.clip(y0 + 1, 0, height - 1)
+    
+    # Split into contiguous R, G and B planes so every gather, blend and
+    # brightness step below is one flat array op per channel
+    planes = pixels.transpose(2, 0, 1).reshape(3, -1)
+    
+    # Gather all four neighbours of every sample point in one fancy index
+    p00, p01, p10, p11 = planes[:, np.stack((y0 * width + x0, y0 * width + x1,
+                                             y1 * width + x0, y1 * width + x1))].transpose(1, 0, 2, 3)
+    top = p00 * (1 - fx) + p01 * fx
+    bottom = p10 * (1 - fx) + p11 * fx
+    r, g, b = scale_brightness((top * (1 - fy) + bottom * fy).astype(np.uint16))
+    
+    rays = pack_colors(r, g, b)
+    rays[~valid] = 0
+    return rays
+
+
 def load_image_data(image_path):
     """Load image for POV display"""
     try:
         print(f"Loading image: {image_path}")
-        image = Image.open(image_path)
+        with Image.open(image_path) as image:
+            # Let the JPEG decoder scale down by 1/2-1/8 while decoding - only
+            # NUM_LEDS points per ray are sampled, so full resolution is wasted
+            # (no-op for other formats)
+            image.draft('RGB', (NUM_LEDS * 4, NUM_LEDS * 4))
+            
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
+            
+            # Convert once at (near) native size, no resize - the sampler
+            # reads straight from the source pixels
+            pixels = np.asarray(image, dtype=np.uint8)
         
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
+        data = np.zeros((NUM_DIVISIONS, NUM_LEDS), dtype=np.uint32)
+        num_leds_per_side = NUM_LEDS // 2
+        radial_fracs = np.arange(1, num_leds_per_side + 1) / num_leds_per_side
         
-        # Resize for consistency
-        target_size = 600
-        if image.size[0] != target_size or image.size[1] != target_size:
-            image = image.resize((target_size, target_size), Image.LANCZOS)
+        # Sample both sides in one gather: the first NUM_DIVISIONS rays are
+        # each line's own angle, the rest the opposite angle (cos/sin negated)
+        rays = _sample_polar(pixels, np.concatenate((LINE_COS, -LINE_COS)),
+                             np.concatenate((LINE_SIN, -LINE_SIN)), radial_fracs)
         
-        width, height = image.size
-        center_x, center_y = width // 2, height // 2
-        radius = min(width, height) // 2 - 1
+        # First side (LEDs 0-35) - innermost LED is at the center end
+        data[:, :num_leds_per_side] = rays[:NUM_DIVISIONS, ::-1]
         
-        data = []
-        angle_increment = 360.0 / NUM_DIVISIONS
-        num_leds_per_side = NUM_LEDS // 2
-        off_color = make_color(0, 0, 0)
-        
-        for slice_idx in range(NUM_DIVISIONS):
-            line = [off_color] * NUM_LEDS
-            angle_deg = slice_idx * angle_increment
-            angle_rad = math.radians(angle_deg)
-            
-            # First side (LEDs 0-35)
-            for led_idx in range(num_leds_per_side):
-                radial_dist = (led_idx + 1) * (radius / num_leds_per_side)
-                x = int(center_x + radial_dist * math.cos(angle_rad))
-                y = int(center_y + radial_dist * math.sin(angle_rad))
-                
-                if 0 <= x < width and 0 <= y < height:
-                    r, g, b = image.getpixel((x, y))
-                    led_pos = num_leds_per_side - led_idx - 1
-                    line[led_pos] = make_color(r * BRIGHTNESS_RATIO, 
-                                               g * BRIGHTNESS_RATIO, 
-                                               b * BRIGHTNESS_RATIO)
-            
-            # Second side (LEDs 36-71) - opposite angle
-            opposite_angle_rad = angle_rad + math.pi
-            for led_idx in range(num_leds_per_side):
-                radial_dist = (led_idx + 1) * (radius / num_leds_per_side)
-                x = int(center_x + radial_dist * math.cos(opposite_angle_rad))
-                y = int(center_y + radial_dist * math.sin(opposite_angle_rad))
-                
-                if 0 <= x < width and 0 <= y < height:
-                    r, g, b = image.getpixel((x, y))
-                    led_pos = num_leds_per_side + led_idx
-                    line[led_pos] = make_color(r * BRIGHTNESS_RATIO, 
-                                               g * BRIGHTNESS_RATIO, 
-                                               b * BRIGHTNESS_RATIO)
-            
-            data.append(line)
+        # Second side (LEDs 36-71) - opposite angle
+        data[:, num_leds_per_side:2 * num_leds_per_side] = rays[NUM_DIVISIONS:]
         
         print("✓ Image loaded!")
         return data
@@ -335,39 +492,26 @@ def load_binary_image_data(binary_data, color_rgb=(255, 255, 255)):
         color_rgb: Color for lit pixels (R, G, B tuple)
     
     Returns:
-        Display data array compatible with POV display
+        (divisions, NUM_LEDS) uint32 array of packed colors for the POV display
     """
     r, g, b = color_rgb
-    data = []
     
     num_divisions = len(binary_data)
     bytes_per_line = len(binary_data[0]) if binary_data else 0
     
     print(f"Loading binary image: {num_divisions} divisions, {bytes_per_line} bytes/line")
     
-    # Pre-calculate colors
-    pixel_color = make_color(r * BRIGHTNESS_RATIO, g * BRIGHTNESS_RATIO, b * BRIGHTNESS_RATIO)
-    off_color = make_color(0, 0, 0)
+    # Pad with blank lines if binary data has fewer divisions than configured
+    data = np.zeros((max(num_divisions, NUM_DIVISIONS), NUM_LEDS), dtype=np.uint32)
     
-    for slice_idx in range(num_divisions):
-        line = [off_color] * NUM_LEDS
-        
-        for byte_idx in range(bytes_per_line):
-            byte_val = binary_data[slice_idx][byte_idx]
-            
-            for bit in range(8):
-                led_pos = byte_idx * 8 + bit
-                
-                if led_pos < NUM_LEDS:
-                    # MSB first (bit 7 = first pixel in byte)
-                    if byte_val & (1 << (7 - bit)):
-                        line[led_pos] = pixel_color
-        
-        data.append(line)
+    # Pre-calculate colors
+    pixel_color = make_color(scale_brightness(r), scale_brightness(g), scale_brightness(b))
     
-    # Pad if binary data has fewer divisions than configured
-    while len(data) < NUM_DIVISIONS:
-        data.append([off_color] * NUM_LEDS)
+    if num_divisions:
+        # Expand every byte into its 8 pixels at once - unpackbits is
+        # MSB first (bit 7 = first pixel in byte), same as the converter
+        bits = np.unpackbits(np.array(binary_data, dtype=np.uint8), axis=1)[:, :NUM_LEDS]
+        data[:num_divisions, :bits.shape[1]] = np.where(bits, np.uint32(pixel_color), np.uint32(0))
     
     print(f"✓ Binary image loaded ({len(data)} divisions)")
     return data
@@ -396,215 +540,334 @@ Image_1 = [
 
 
 
+# ============== DISPLAY DATA ==============
+
+# Source line drawn at each display position - LINES_TO_SHIFT folded into a
+# fixed permutation, so the display loop never adds or wraps line numbers
+LINE_ORDER = (np.arange(NUM_DIVISIONS) + LINES_TO_SHIFT) % NUM_DIVISIONS
+
+def set_display_data(data):
+    """
+    Install new display data for the display loop.
+    
+    The LINES_TO_SHIFT rotation adjustment (and the SPI encoding or ctypes
+    line views) is applied here, once per mode change, so
+    display_current_line() can index lines by current_line directly.
+    """
+    global spi_frames, display_lines
+    # One contiguous uint32 block, so every line is NUM_LEDS * 4 bytes
+    # that can be handed to the LED backend as-is
+    shifted = np.ascontiguousarray(np.asarray(data)[LINE_ORDER], dtype=np.uint32)
+    if LED_USE_SPI:
+        # One ready-made bytes object per line - nothing to build per line
+        spi_frames = [frame.tobytes() for frame in encode_spi_frames(shifted)]
+    else:
+        # Each view keeps shifted alive, so a line being copied by the
+        # display thread can't be freed by a concurrent mode change
+        display_lines = [(ctypes.c_uint32 * NUM_LEDS).from_buffer(line) for line in shifted]
+
+
 # ============== BUTTON POLLING ==============
 
+# Button → mode table, built once rather than on every poll
+BUTTONS = [
+    (BUTTON_CIRCLE, "circle", lambda: generate_circle_data(radius_leds=28, color_rgb=(0, 255, 255)), "CIRCLE"),
+    (BUTTON_SQUARE, "square", lambda: generate_square_data(side_length_leds=24, color_rgb=(255, 0, 255)), "SQUARE"),
+    (BUTTON_IMAGE, "image", lambda: load_binary_image_data(Image_1, color_rgb=(0, 255, 255)), "IMAGE")
+]
+
+
 def check_buttons():
-    """Poll buttons for mode changes"""
-    global display_data, current_mode, last_button_states, last_button_time
+    """
+    Poll buttons for mode changes.
+    Called every BUTTON_POLL_INTERVAL from the main thread - buttons can't
+    change faster than that, and an idle poll is a single bulk pin read.
+    """
+    global current_mode, last_button_states
     
-    current_time = time.time()
+    # Values are already debounced by the kernel - a press is just a
+    # released → pressed change since the last poll
+    states = button_request.get_values(BUTTON_PINS)
     
-    buttons = [
-        (BUTTON_CIRCLE, "circle", lambda: generate_circle_data(radius_leds=28, color_rgb=(0, 255, 255)), "CIRCLE"),
-        (BUTTON_SQUARE, "square", lambda: generate_square_data(side_length_leds=24, color_rgb=(255, 0, 255)), "SQUARE"),
-        (BUTTON_IMAGE, "image", lambda: load_binary_image_data(Image_1, color_rgb=(0, 255, 255)), "IMAGE")
-    ]
+    for (_, mode_name, _, display_name), current_state, last_state in zip(BUTTONS, states, last_button_states):
+        if current_state == Value.ACTIVE and last_state == Value.INACTIVE:
+            print(f"\n✓ Mode: {display_name}")
+            current_mode = mode_name
+            set_display_data(mode_frames[mode_name])
     
-    for button_pin, mode_name, mode_func, display_name in buttons:
-        current_state = GPIO.input(button_pin)
-        
-        if current_state == GPIO.LOW and last_button_states[button_pin] == GPIO.HIGH:
-            if current_time - last_button_time[button_pin] > DEBOUNCE_TIME:
-                print(f"\n✓ Mode: {display_name}")
-                current_mode = mode_name
-                display_data = mode_func()
-                last_button_time[button_pin] = current_time
-        
-        last_button_states[button_pin] = current_state
+    last_button_states = states
+
 
+# ============== HALL SENSOR ==============
+
+def watch_hall_sensor():
+    """
+    Background thread - wait for magnet edges from the kernel GPIO driver.
+    
+    The kernel timestamps each rising edge in its interrupt handler, so the
+    rotation timing stays exact even while the display thread is busy with
+    an LED update. Edges are queued in hall_edges; display_loop() drains
+    them into handle_hall_edge() on the display thread between lines. The
+    main thread only polls the buttons.
+    
+    No kernel debounce on this line: on the Pi it is emulated with a
+    delayed work item, which rounds up to a jiffy and timestamps the edge
+    late. Re-triggers are dropped in handle_hall_edge() (HALL_DEBOUNCE_US).
+    """
+    # Real-time as well, so a busy main thread can't delay an edge reaching
+    # the display thread (display_loop() already warns if this isn't allowed)
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(HALL_THREAD_PRIORITY))
+    except OSError:
+        pass
+    
+    settings = gpiod.LineSettings(edge_detection=Edge.RISING, bias=Bias.PULL_DOWN)
+    with gpiod.request_lines(GPIO_CHIP, consumer="pov-fan",
+                             config={HALL_SENSOR_PIN: settings}) as request:
+        while True:
+            for event in request.read_edge_events():
+                hall_edges.append(event.timestamp_ns // 1000)
 
-# ============== HALL SENSOR POLLING ==============
 
-def check_hall_sensor():
+def handle_hall_edge(current_time):
     """
-    Poll hall sensor with noise filtering and debouncing.
+    Process one magnet edge (0° position) with noise filtering and debouncing.
     Key improvements:
-    1. Hardware debounce - ignore triggers too close together
+    1. Software debounce - ignore kernel timestamps within HALL_DEBOUNCE_US
+       of the last one (the hall line has no kernel or hardware filter)
     2. RPM validation - reject readings outside expected range
-    3. Outlier rejection - reject sudden RPM jumps (noise)
-    4. Aggressive smoothing - average over 15 rotations
+    3. Outlier rejection - reject readings far outside the predicted spread
+    4. Smoothing - scalar Kalman filter, gain set by the measured noise and
+       loosened while readings keep disagreeing with it (speed changes)
+    
+    Args:
+        current_time: Kernel timestamp of the edge in microseconds
     """
-    global last_hall_state, last_rotation_micros, rotation_time_micros
-    global time_per_line_micros, current_line, rotation_count, rotation_active
-    global current_rpm, stable_rpm, rpm_history, missed_lines_count
+    global last_rotation_micros, rotation_time_micros
+    global time_per_line_micros, line_offsets_micros, current_line, rotation_count, display_step
+    global rotation_start_micros, current_rpm, stable_rpm, stable_rpm_variance, missed_lines_count
+    global rpm_history, rpm_sq_diffs, rpm_sq_diff_sum, rpm_innovation_sq_avg
     global last_hall_trigger_time, valid_rotation_count, noise_rejected_count
     global rpm_locked, rpm_stable_count
     
-    current_state = GPIO.input(HALL_SENSOR_PIN)
+    # DEBOUNCE: Ignore triggers too close to last one (noise/bounce)
+    time_since_last = current_time - last_hall_trigger_time
+    if time_since_last < HALL_DEBOUNCE_US:
+        noise_rejected_count += 1
+        return
+    
+    last_hall_trigger_time = current_time
     
-    # Detect rising edge = magnet detected = 0° position
-    if current_state == GPIO.HIGH and last_hall_state == GPIO.LOW:
-        current_time = get_time_micros()
+    # Calculate rotation time
+    if last_rotation_micros > 0:
+        measured_rotation_time = current_time - last_rotation_micros
         
-        # DEBOUNCE: Ignore triggers too close to last one (noise/bounce)
-        time_since_last = current_time - last_hall_trigger_time
-        if time_since_last < HALL_DEBOUNCE_US:
-            last_hall_state = current_state
+        # VALIDATION 1: Check if rotation time is in valid RPM range
+        if not (MIN_ROTATION_US <= measured_rotation_time <= MAX_ROTATION_US):
+            # Outside valid range - likely noise
             noise_rejected_count += 1
+            # Still reset position but don't update timing
+            current_line = 0
+            rotation_start_micros = current_time
+            rotation_count += 1
+            last_rotation_micros = current_time
             return
         
-        last_hall_trigger_time = current_time
+        # Calculate instant RPM
+        instant_rpm = 60_000_000 / measured_rotation_time
         
-        # Calculate rotation time
-        if last_rotation_micros > 0:
-            measured_rotation_time = current_time - last_rotation_micros
-            
-            # VALIDATION 1: Check if rotation time is in valid RPM range
-            min_rotation_time = int(60_000_000 / MAX_RPM)  # ~42ms at 1400 RPM
-            max_rotation_time = int(60_000_000 / MIN_RPM)  # ~240ms at 250 RPM
-            
-            if not (min_rotation_time <= measured_rotation_time <= max_rotation_time):
-                # Outside valid range - likely noise
+        # Measurement noise from the rotation-to-rotation scatter of recent
+        # readings - differencing cancels a steady spin-up, so acceleration
+        # isn't mistaken for noise
+        if len(rpm_history) >= 3:
+            measurement_variance = max(rpm_sq_diff_sum / (2 * len(rpm_sq_diffs)),
+                                       RPM_MIN_MEASUREMENT_VARIANCE)
+        else:
+            measurement_variance = RPM_MIN_MEASUREMENT_VARIANCE
+        
+        # Predict: the real speed may have drifted since the last rotation.
+        # Readings that keep landing further off than P + R explain mean the
+        # speed is moving (step or ramp), so the excess becomes process noise
+        # and the filter loosens until it tracks again.
+        process_noise = max(RPM_PROCESS_NOISE,
+                            rpm_innovation_sq_avg - stable_rpm_variance - measurement_variance)
+        stable_rpm_variance += process_noise
+        
+        innovation = instant_rpm - stable_rpm
+        innovation_variance = stable_rpm_variance + measurement_variance
+        
+        # Every in-range reading counts, including the ones gated out below -
+        # otherwise a real speed change could never widen the gate
+        rpm_innovation_sq_avg += RPM_INNOVATION_WEIGHT * (innovation * innovation - rpm_innovation_sq_avg)
+        
+        # VALIDATION 2: Reject readings far outside the predicted spread (outliers).
+        # A lone spike is dropped; if the next readings agree with it the
+        # inflated process noise widens the gate and lets them through.
+        if len(rpm_history) >= 3:
+            if innovation * innovation > RPM_GATE_SIGMA ** 2 * innovation_variance:
+                # Too big a jump - likely noise, reject it
                 noise_rejected_count += 1
-                last_hall_state = current_state
-                # Still reset position but don't update timing
                 current_line = 0
+                rotation_start_micros = current_time
                 rotation_count += 1
                 last_rotation_micros = current_time
                 return
-            
-            # Calculate instant RPM
-            instant_rpm = 60_000_000 / measured_rotation_time
-            
-            # VALIDATION 2: Reject sudden RPM jumps (outliers)
-            if len(rpm_history) >= 3:
-                avg_rpm = sum(rpm_history) / len(rpm_history)
-                rpm_change_percent = abs(instant_rpm - avg_rpm) / avg_rpm * 100
-                
-                if rpm_change_percent > MAX_RPM_CHANGE_PERCENT:
-                    # Too big a jump - likely noise, reject it
-                    noise_rejected_count += 1
-                    last_hall_state = current_state
-                    current_line = 0
-                    rotation_count += 1
-                    last_rotation_micros = current_time
-                    return
-            
-            # Valid reading! Add to history
-            rpm_history.append(instant_rpm)
-            if len(rpm_history) > RPM_HISTORY_SIZE:
-                rpm_history.pop(0)
-            
-            valid_rotation_count += 1
-            
-            # Calculate smoothed RPM (median is more robust than mean)
-            if len(rpm_history) >= 5:
-                sorted_rpm = sorted(rpm_history)
-                # Use trimmed mean (remove highest and lowest, average rest)
-                trimmed = sorted_rpm[2:-2] if len(sorted_rpm) > 6 else sorted_rpm[1:-1]
-                stable_rpm = sum(trimmed) / len(trimmed) if trimmed else sum(sorted_rpm) / len(sorted_rpm)
-            else:
-                stable_rpm = sum(rpm_history) / len(rpm_history)
-            
-            current_rpm = stable_rpm
-            
-            # Calculate timing from stable RPM
-            rotation_time_micros = int(60_000_000 / stable_rpm)
-            time_per_line_micros = rotation_time_micros // NUM_DIVISIONS
-            
-            # Sanity check - ensure minimum time for LED update
-            if time_per_line_micros < LED_UPDATE_TIME_US:
-                time_per_line_micros = LED_UPDATE_TIME_US
-            
-            # Display status periodically (less spam)
-            if valid_rotation_count % 50 == 0:
-                max_safe = rotation_time_micros // LED_UPDATE_TIME_US
-                status = "✓" if NUM_DIVISIONS <= max_safe else "⚠"
-                print(f"{status} RPM: {stable_rpm:.0f} | "
-                      f"Line time: {time_per_line_micros}µs | "
-                      f"Noise rejected: {noise_rejected_count}")
         
-        # Reset to position 0° (line 0)
-        current_line = 0
-        rotation_active = True
-        rotation_count += 1
-        last_rotation_micros = current_time
+        # Valid reading! Add to history (the rings drop the oldest entry,
+        # the running sum is updated to match - O(1) per rotation)
+        if rpm_history:
+            if len(rpm_sq_diffs) == rpm_sq_diffs.maxlen:
+                rpm_sq_diff_sum -= rpm_sq_diffs[0]
+            sq_diff = (instant_rpm - rpm_history[-1]) ** 2
+            rpm_sq_diffs.append(sq_diff)
+            rpm_sq_diff_sum += sq_diff
+        rpm_history.append(instant_rpm)
         
-        if rotation_count == 1:
-            print("\n✓ ROTATION DETECTED!")
-            print(f"  Divisions: {NUM_DIVISIONS} ({360/NUM_DIVISIONS:.1f}° each)")
-            print(f"  LED update: ~{LED_UPDATE_TIME_US}µs")
-            print(f"  Default RPM: {DEFAULT_RPM}")
-            print("Display active. Press buttons to change modes.\n")
-    
-    last_hall_state = current_state
+        valid_rotation_count += 1
+        
+        # Update: weigh the reading against the prediction by their
+        # uncertainties - noisy readings move stable_rpm less
+        gain = stable_rpm_variance / innovation_variance
+        stable_rpm += gain * innovation
+        stable_rpm_variance *= 1 - gain
+        
+        current_rpm = stable_rpm
+        
+        # Calculate timing from stable RPM
+        rotation_time_micros = int(60_000_000 / stable_rpm)
+        time_per_line_micros = rotation_time_micros // NUM_DIVISIONS
+        line_offsets_micros = [i * rotation_time_micros // NUM_DIVISIONS for i in range(NUM_DIVISIONS)]
+        
+        # Sanity check - ensure minimum time for LED update
+        if time_per_line_micros < LED_UPDATE_TIME_US:
+            time_per_line_micros = LED_UPDATE_TIME_US
+        
+        # Display status periodically (less spam)
+        if valid_rotation_count % 50 == 0:
+            max_safe = rotation_time_micros // LED_UPDATE_TIME_US
+            status = "✓" if NUM_DIVISIONS <= max_safe else "⚠"
+            print(f"{status} RPM: {stable_rpm:.0f} | "
+                  f"Line time: {time_per_line_micros}µs | "
+                  f"Noise rejected: {noise_rejected_count}")
+    
+    # Reset to position 0° (line 0)
+    current_line = 0
+    rotation_start_micros = current_time
+    display_step = display_current_line
+    rotation_count += 1
+    last_rotation_micros = current_time
+    
+    if rotation_count == 1:
+        print("\n✓ ROTATION DETECTED!")
+        print(f"  Divisions: {NUM_DIVISIONS} ({360/NUM_DIVISIONS:.1f}° each)")
+        print(f"  LED update: ~{LED_UPDATE_TIME_US}µs")
+        print(f"  Default RPM: {DEFAULT_RPM}")
+        print("Display active. Press buttons to change modes.\n")
 
 
 # ============== DISPLAY FUNCTION - OPTIMIZED ==============
 
+def wait_until_ns(target_ns):
+    """Sleep until just before target_ns, then busy-wait the rest for µs accuracy"""
+    now_ns = monotonic_ns  # Local name - the spin below calls it in a tight loop
+    if target_ns - now_ns() > SLEEP_SPIN_US * 1000:
+        # Frees the CPU (and the GIL) for the hall sensor thread
+        sleep_until_ns(target_ns - SLEEP_SPIN_US * 1000)
+    while now_ns() < target_ns:
+        pass
+
+
+def wait_for_rotation():
+    """Display step until the first hall edge - nothing to show, don't hog the CPU"""
+    time.sleep(0.001)
+
+
 def display_current_line():
     """
-    Display the current line with optimized timing.
-    Key insight: LED update takes significant time (~2.5ms for 72 LEDs)
-    We must account for this in our timing calculations.
+    Display the current line at its angular position.
+    Key insight: every line has an absolute start time measured from the
+    hall edge (start + line * rotation_time / NUM_DIVISIONS), so timing
+    errors never accumulate over a rotation - a late line only affects itself.
     """
-    global current_line, actual_line_time_us, missed_lines_count
-    
-    if not rotation_active or time_per_line_micros <= 0:
+    global current_line, rotation_start_micros, actual_line_time_us, missed_lines_count
+    
+    line_start = rotation_start_micros + line_offsets_micros[current_line]
+    now = monotonic_ns() // 1000
+    
+    # Already past the next line's start time? Don't draw stale lines -
+    # jump straight to the line whose slot we're in, however far behind
+    if now > line_start + time_per_line_micros:
+        target_line = max((now - rotation_start_micros) * NUM_DIVISIONS // rotation_time_micros,
+                          current_line + 1)
+        missed_lines_count += target_line - current_line
+        rotation_start_micros += (target_line // NUM_DIVISIONS) * rotation_time_micros
+        current_line = target_line % NUM_DIVISIONS
         return
     
-    # Which line to show (with rotation adjustment)
-    line_to_show = (current_line + LINES_TO_SHIFT + NUM_DIVISIONS) % NUM_DIVISIONS
+    wait_until_ns(line_start * 1000)
     
-    # Start timing for this line
-    line_start_time = get_time_micros()
-    
-    # Set LEDs for this line
-    if display_data and line_to_show < len(display_data):
-        line_data = display_data[line_to_show]
-        for i in range(NUM_LEDS):
-            strip.setPixelColor(i, line_data[i])
-        strip.show()
-    
-    # Calculate how long LED update took
-    update_time = get_time_micros() - line_start_time
-    actual_line_time_us = update_time
-    
-    # Wait the remaining time for this angular position
-    remaining = time_per_line_micros - update_time - TIMING_MARGIN_US
-    
-    if remaining > 0:
-        # Precise busy-wait for accurate timing
-        target_time = get_time_micros() + remaining
-        while get_time_micros() < target_time:
-            pass
-    elif remaining < -1000:  # More than 1ms behind
-        # We're running behind - the fan is spinning faster than we can update
-        # Skip to catch up (this prevents image from drifting)
-        lines_to_skip = int((-remaining) / time_per_line_micros)
-        if lines_to_skip > 0:
-            current_line += lines_to_skip
-            missed_lines_count += lines_to_skip
+    # Set LEDs for this line - one memmove into the strip buffer
+    update_start_ns = monotonic_ns()
+    if LED_USE_SPI:
+        spi_write(spi_frames[current_line])
+    else:
+        memmove(led_buffer_addr, display_lines[current_line], LINE_BYTES)
+        strip_show()
+    actual_line_time_us = (monotonic_ns() - update_start_ns) // 1000
     
     # Move to next line
     current_line += 1
     if current_line >= NUM_DIVISIONS:
+        # No hall edge yet - carry on into the next rotation at the current RPM
         current_line = 0
+        rotation_start_micros += rotation_time_micros
+
+
+# ============== DISPLAY THREAD ==============
+
+def display_loop():
+    """
+    Display thread - process hall edges and draw lines until stop_display is set.
+    Runs at real-time priority so the scheduler can't preempt it mid-line.
+    """
+    global display_step
+    
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(DISPLAY_THREAD_PRIORITY))
+    except OSError:
+        print("⚠ Could not set real-time priority (run as root) - display may jitter")
+    
+    # Stay on one core - no migrations, and with isolcpus nothing else runs there
+    try:
+        os.sched_setaffinity(0, {DISPLAY_CPU})
+    except OSError:
+        print(f"⚠ Could not pin display thread to CPU {DISPLAY_CPU}")
+    
+    # The first hall edge switches this to display_current_line(), so the
+    # loop itself never has to check whether the fan is spinning
+    display_step = wait_for_rotation
+    
+    # Bound methods looked up once, not on every pass
+    stopping = stop_display.is_set
+    next_edge = hall_edges.popleft
+    
+    while not stopping():
+        while hall_edges:
+            handle_hall_edge(next_edge())
+        display_step()
 
 
 # ============== MAIN LOOP ==============
 
 def main():
-    global display_data
-    
     # Calculate timing info
-    rotation_time_at_default = int(60_000_000 / DEFAULT_RPM)
+    rotation_time_at_default = 60_000_000 // DEFAULT_RPM
     time_per_line_at_default = rotation_time_at_default // NUM_DIVISIONS
     max_safe_divisions = rotation_time_at_default // LED_UPDATE_TIME_US
     degrees_per_division = 360.0 / NUM_DIVISIONS
     
     # Calculate for RPM range
-    rotation_time_at_max = int(60_000_000 / MAX_RPM)
+    rotation_time_at_max = 60_000_000 // MAX_RPM
     max_safe_at_max_rpm = rotation_time_at_max // LED_UPDATE_TIME_US
     
     print("\n" + "="*65)
@@ -627,12 +890,12 @@ def main():
     if NUM_DIVISIONS <= max_safe_at_max_rpm:
         print(f"\n  ✓ {NUM_DIVISIONS} divisions is SAFE for your RPM range!")
     else:
-        print(f"\n  ⚠ May have issues above ~{int(60_000_000 / (NUM_DIVISIONS * LED_UPDATE_TIME_US))} RPM")
+        print(f"\n  ⚠ May have issues above ~{60_000_000 // (NUM_DIVISIONS * LED_UPDATE_TIME_US)} RPM")
     
     print("\n▸ NOISE FILTERING:")
     print(f"  • Hall debounce: {HALL_DEBOUNCE_US}µs")
-    print(f"  • Max RPM change: {MAX_RPM_CHANGE_PERCENT}%")
-    print(f"  • Smoothing: {RPM_HISTORY_SIZE} samples")
+    print(f"  • RPM outlier gate: {RPM_GATE_SIGMA:.0f}σ")
+    print(f"  • Smoothing: Kalman, noise from last {RPM_HISTORY_SIZE} samples, adaptive process noise")
     
     print("\n▸ CONTROLS:")
     print("  • GPIO 17 → Circle (cyan)")
@@ -643,21 +906,36 @@ def main():
     print("  Spin the fan to start!")
     print("="*65 + "\n")
     
+    # Generate every mode's data up front - a button press then never has
+    # to redraw a shape or reload an image while the fan is spinning
+    for _, mode_name, mode_func, _ in BUTTONS:
+        mode_frames[mode_name] = mode_func()
+    
     # Generate initial shape
-    display_data = generate_circle_data(radius_leds=26, color_rgb=(0, 255, 255))
+    set_display_data(generate_circle_data(radius_leds=26, color_rgb=(0, 255, 255)))
     
     # Startup indicator
-    for i in range(NUM_LEDS):
-        strip.setPixelColor(i, make_color(0, 30, 0) if i < 3 else make_color(0, 0, 0))
-    strip.show()
+    indicator = np.zeros(NUM_LEDS, dtype=np.uint32)
+    indicator[:3] = make_color(0, 30, 0)
+    show_pixels(indicator)
+    
+    # Keep every page resident - a page fault mid-line costs far more than a line
+    if libc.mlockall(MCL_CURRENT | MCL_FUTURE) != 0:
+        print("⚠ Could not lock memory (run as root) - display may jitter")
+    
+    # Hall sensor edges arrive from the kernel on a background thread
+    threading.Thread(target=watch_hall_sensor, daemon=True).start()
+    display_thread = threading.Thread(target=display_loop, daemon=True)
+    display_thread.start()
     
     try:
         while True:
             check_buttons()
-            check_hall_sensor()
-            display_current_line()
+            time.sleep(BUTTON_POLL_INTERVAL)
                 
     except KeyboardInterrupt:
+        stop_display.set()
+        display_thread.join()
         print("\n\n" + "-"*50)
         print("SHUTDOWN STATS:")
         print(f"  • Total rotations: {rotation_count}")
@@ -670,7 +948,7 @@ def main():
         print("-"*50)
         
     finally:
-        GPIO.cleanup()
+        button_request.release()
         print("Done!\n")
 
 